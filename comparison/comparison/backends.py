@@ -0,0 +1,108 @@
+"""Registry of tree implementations that the comparison harness can benchmark.
+
+Only backends defined in this module, or in modules imported from it, are
+registered when the command line is built, so new backends belong here.
+"""
+
+from functools import partial
+from typing import Callable, Dict, List, Optional, Protocol, Type
+
+from .list_process import ListProcessor
+from .set import Graph as SetGraph
+
+
+class Backend(Protocol):
+    """The operations every benchmarked tree implementation must provide.
+
+    Backends expose the data structure's own methods as attributes where
+    possible, so the harness times the data structure rather than a wrapper.
+    """
+
+    name: str
+
+    def insert(self, parent: int, child: int) -> object:
+        """Insert a parent-child edge."""
+
+    def lookup(self, parent: int, child: int) -> bool:
+        """Check if a parent-child edge exists."""
+
+    def delete(self, parent: int, child: int) -> object:
+        """Delete a parent-child edge."""
+
+    def size(self) -> int:
+        """Return the size of the tree."""
+
+
+BACKENDS: Dict[str, Type[Backend]] = {}
+
+# Profile names used by the harness itself rather than by a backend
+HARNESS = "Harness"
+MUTABLE_SET = "Mutable Set"
+FROZEN_SET = "Frozen Set"
+RESERVED_NAMES = {HARNESS, MUTABLE_SET, FROZEN_SET}
+
+
+def register_backend(key: str) -> Callable[[Type[Backend]], Type[Backend]]:
+    """Register a backend class under a command line key.
+
+    Args:
+        key: The name used to select the backend with --impl
+
+    Returns:
+        Callable: A class decorator that adds the backend to the registry
+    """
+    def decorator(backend: Type[Backend]) -> Type[Backend]:
+        if key in BACKENDS:
+            raise ValueError(f"A backend named '{key}' is already registered.")
+        # Timings and profiles are reported by display name, so it must be unique
+        if backend.name in RESERVED_NAMES:
+            raise ValueError(f"The name '{backend.name}' is reserved for the harness.")
+        if any(registered.name == backend.name for registered in BACKENDS.values()):
+            raise ValueError(f"A backend displayed as '{backend.name}' is already registered.")
+        BACKENDS[key] = backend
+        return backend
+
+    return decorator
+
+
+def create_backends(keys: Optional[List[str]] = None) -> List[Backend]:
+    """Create fresh instances of the selected backends in registry order.
+
+    Args:
+        keys: The registry keys to create, or None for every backend
+
+    Returns:
+        List[Backend]: One new, empty instance per selected backend
+    """
+    if keys is None:
+        keys = list(BACKENDS)
+    unknown = [key for key in keys if key not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown implementation(s): {', '.join(unknown)}")
+    return [BACKENDS[key]() for key in BACKENDS if key in keys]
+
+
+@register_backend("set")
+class SetBackend:
+    name = "Set"
+
+    def __init__(self) -> None:
+        """Wrap a dictionary of sets graph."""
+        self.tree = SetGraph()
+        self.insert = self.tree.insert_edge
+        self.lookup = self.tree.lookup_edge
+        self.delete = partial(self.tree.update_edge, add_edge=False)
+        self.size = self.tree.get_graph_size
+
+
+@register_backend("list")
+class ListBackend:
+    name = "List"
+
+    def __init__(self) -> None:
+        """Wrap a list of parent-child pairs."""
+        self.tree = ListProcessor()
+        self.insert = self.tree.insert_tree_pair
+        self.lookup = self.tree.lookup_tree_pair
+        self.delete = self.tree.delete_tree_pair
+        self.size = self.tree.get_tree_size
@@ -3,18 +3,183 @@
 import argparse
 import sys
 import time
-from typing import List
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
 
-from .set import Graph as SetGraph
-from .list_process import ListProcessor
+from .backends import (
+    BACKENDS,
+    FROZEN_SET,
+    HARNESS,
+    MUTABLE_SET,
+    Backend,
+    create_backends,
+)
 from .generate import generate_random_tree_with_random_values_list
+from .profiling import OperationProfiler
+from .set import Graph as SetGraph
+
+# Column styles assigned to implementations in registration order
+IMPLEMENTATION_STYLES = ["green", "yellow", "blue", "red", "magenta"]
+
+
+def time_operation(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Time a single data structure call."""
+    start_time = time.time()
+    result = func(*args)
+    end_time = time.time()
+    return result, end_time - start_time
+
+
+def profile_call(
+    profiler: Optional[OperationProfiler],
+    implementation: str,
+    operation: str,
+    func: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    """Call a function, under the implementation/operation profile if profiling."""
+    if profiler is None:
+        return func(*args)
+    return profiler.runcall(implementation, operation, func, *args)
+
+
+def run_step(
+    method: Callable[..., Any],
+    operation_times: List[float],
+    describe: Callable[[Any], str],
+    cells: Optional[List[str]],
+    *args: Any,
+) -> None:
+    """Time one backend call and record its timing and formatted result.
+
+    This is the per-edge harness work of one implementation, so in profile
+    mode it runs under that implementation's profile and its frames show up
+    next to the data structure frames.
+    """
+    result, elapsed = time_operation(method, *args)
+    operation_times.append(elapsed)
+    if cells is not None:
+        cells.append(describe(result))
+
+
+def add_edge_row(table: Table, v1: int, v2: int, cells: List[str]) -> None:
+    """Add the row for one edge with the results of every implementation."""
+    table.add_row(f"({v1}, {v2})", *cells)
+
+
+def measure_memory(func: Callable[..., Any], *args: Any) -> Tuple[Any, int]:
+    """Call a function and return its result with the bytes it left allocated."""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, allocated
+
 
+def build_set_graph(edges: List[Tuple[int, int]]) -> SetGraph:
+    """Build a mutable set graph from a list of edges."""
+    graph = SetGraph()
+    for v1, v2 in edges:
+        graph.insert_edge(v1, v2)
+    return graph
+
+
+def run_frozen_comparison(
+    edges: List[Tuple[int, int]],
+    profiler: Optional[OperationProfiler] = None,
+) -> Table:
+    """Compare lookup throughput and memory of a mutable and a frozen set graph."""
+    # Memory is measured on fresh builds so that earlier phases do not count
+    mutable_tree, mutable_memory = measure_memory(build_set_graph, edges)
+    frozen_tree, frozen_memory = measure_memory(mutable_tree.freeze)
+
+    frozen_table = Table(title="Frozen vs Mutable Set Comparison")
+    frozen_table.add_column("Implementation", style="green")
+    frozen_table.add_column("Operation", style="cyan")
+    frozen_table.add_column("Repetitions", style="yellow")
+    frozen_table.add_column("Total Time (sec)", style="white")
+    frozen_table.add_column("Throughput (ops/sec)", style="magenta")
+    frozen_table.add_column("Memory (bytes)", style="blue")
+
+    # The two get_neighbors calls do different work, so the rows say which
+    for name, tree, memory, neighbors_label in [
+        (MUTABLE_SET, mutable_tree, mutable_memory, "Neighbors (live set)"),
+        (FROZEN_SET, frozen_tree, frozen_memory, "Neighbors (new sorted tuple)"),
+    ]:
+        lookup_times: List[float] = []
+        neighbor_times: List[float] = []
+        for v1, v2 in edges:
+            profile_call(
+                profiler, name, "Lookup", run_step,
+                tree.lookup_edge, lookup_times, str, None, v1, v2)
+            profile_call(
+                profiler, name, "Neighbors", run_step,
+                tree.get_neighbors, neighbor_times, str, None, v1)
+
+        for operation, times in [("Lookup", lookup_times), (neighbors_label, neighbor_times)]:
+            total = sum(times)
+            throughput = f"{len(times) / total:.0f}" if total > 0 else "inf"
+            frozen_table.add_row(
+                name,
+                operation,
+                str(len(times)),
+                f"{total:.10f}",
+                throughput,
+                str(memory))
+
+    return frozen_table
+
+
+class Phase(NamedTuple):
+    """One benchmark phase: its table title, operation, backend method and result text."""
+
+    title: str
+    operation: str
+    method: str
+    describe: Callable[[Any], str]
+
+
+def run_phase(
+    phase: Phase,
+    edges: List[Tuple[int, int]],
+    backends: List[Backend],
+    times: Dict[Tuple[str, str], List[float]],
+    profiler: Optional[OperationProfiler] = None,
+) -> Table:
+    """Run one operation over every edge for each backend and tabulate results."""
+    title, operation, method, describe = phase
+    table = Table(title=title)
+    table.add_column("Parent-Child Edge", style="cyan")
+    for index, backend in enumerate(backends):
+        style = IMPLEMENTATION_STYLES[index % len(IMPLEMENTATION_STYLES)]
+        table.add_column(f"{backend.name} Implementation", style=style)
 
-def run_demo(num_vertices=20, quiet=False):
+    for v1, v2 in edges:
+        cells: List[str] = []
+        for backend in backends:
+            profile_call(
+                profiler, backend.name, operation, run_step,
+                getattr(backend, method), times[backend.name, operation],
+                describe, cells, v1, v2)
+        profile_call(profiler, HARNESS, operation, add_edge_row, table, v1, v2, cells)
+
+    return table
+
+
+def run_demo(
+    num_vertices: int = 20,
+    quiet: bool = False,
+    profile_dir: Optional[str] = None,
+    freeze: bool = False,
+    implementations: Optional[List[str]] = None,
+) -> None:
     console = Console()
+    profiler = OperationProfiler() if profile_dir else None
 
     # Generate tree data
     try:
@@ -23,98 +188,31 @@ def run_demo(num_vertices=20, quiet=False):
         edges = [(1, 2), (2, 3), (3, 4), (4, 5)]
 
     # Initialize implementations
-    set_tree = SetGraph()
-    list_tree = ListProcessor()
-
-    set_insert_times = []
-    list_insert_times = []
-    set_lookup_times = []
-    list_lookup_times = []
-    set_delete_times = []
-    list_delete_times = []
-    set_verify_times = []
-    list_verify_times = []
-
-    # Table for insertion
-    insertion_table = Table(title="Tree Node Insertion Operations")
-    insertion_table.add_column("Parent-Child Edge", style="cyan")
-    insertion_table.add_column("Set Implementation", style="green")
-    insertion_table.add_column("List Implementation", style="yellow")
-
-    # Perform insertions
-    for v1, v2 in edges:
-        set_start_time = time.time()
-        set_tree.insert_edge(v1, v2)
-        set_end_time = time.time()
-        set_insert_times.append((set_end_time - set_start_time))
-
-        list_start_time = time.time()
-        list_tree.insert_tree_pair(v1, v2)
-        list_end_time = time.time()
-        list_insert_times.append((list_end_time - list_start_time))
-
-        insertion_table.add_row(f"({v1}, {v2})", "Success", "Success")
-
-    # Table for lookup
-    lookup_table = Table(title="Tree Node Lookup Operations")
-    lookup_table.add_column("Parent-Child Edge", style="cyan")
-    lookup_table.add_column("Set Implementation", style="green")
-    lookup_table.add_column("List Implementation", style="yellow")
-
-    # Perform lookups
-    for v1, v2 in edges:
-        set_start_time = time.time()
-        set_result = str(set_tree.lookup_edge(v1, v2))
-        set_end_time = time.time()
-        set_lookup_times.append((set_end_time - set_start_time))
-
-        list_start_time = time.time()
-        list_result = str(list_tree.lookup_tree_pair(v1, v2))
-        list_end_time = time.time()
-        list_lookup_times.append((list_end_time - list_start_time))
-
-        lookup_table.add_row(f"({v1}, {v2})", set_result, list_result)
-
-    # Table for deletion
-    deletion_table = Table(title="Tree Node Deletion Operations")
-    deletion_table.add_column("Parent-Child Edge", style="cyan")
-    deletion_table.add_column("Set Implementation", style="green")
-    deletion_table.add_column("List Implementation", style="yellow")
-
-    # Perform deletions
+    backends = create_backends(implementations)
+    operations = ["Insert", "Lookup", "Delete", "Verify Deletion"]
+    times: Dict[Tuple[str, str], List[float]] = {
+        (backend.name, operation): [] for backend in backends for operation in operations
+    }
+
+    # Perform insertions and lookups
+    insertion_table = run_phase(
+        Phase("Tree Node Insertion Operations", "Insert", "insert", lambda _: "Success"),
+        edges, backends, times, profiler)
+    lookup_table = run_phase(
+        Phase("Tree Node Lookup Operations", "Lookup", "lookup", str),
+        edges, backends, times, profiler)
+
+    # Compare frozen and mutable set graphs built from the same edges
+    frozen_table = run_frozen_comparison(edges, profiler) if freeze else None
+
+    # Perform deletions and verify them
     deletion_count = len(edges) // 2
-    for v1, v2 in edges[:deletion_count]:
-        set_start_time = time.time()
-        set_tree.update_edge(v1, v2, False)
-        set_end_time = time.time()
-        set_delete_times.append((set_end_time - set_start_time))
-
-        list_start_time = time.time()
-        list_tree.delete_tree_pair(v1, v2)
-        list_end_time = time.time()
-        list_delete_times.append((list_end_time - list_start_time))
-
-        deletion_table.add_row(f"({v1}, {v2})", "Removed", "Removed")
-
-    # Table for verification
-    verification_table = Table(title="Deletion Verification Operations")
-    verification_table.add_column("Parent-Child Edge", style="cyan")
-    verification_table.add_column("Set Implementation", style="green")
-    verification_table.add_column("List Implementation", style="yellow")
-
-    # Verify deletions
-    for v1, v2 in edges[:deletion_count]:
-        set_start_time = time.time()
-        set_result = str(set_tree.lookup_edge(v1, v2))
-        set_end_time = time.time()
-        set_verify_times.append((set_end_time - set_start_time))
-
-        list_start_time = time.time()
-        list_result = str(list_tree.lookup_tree_pair(v1, v2))
-        list_end_time = time.time()
-        list_verify_times.append((list_end_time - list_start_time))
-
-        verification_table.add_row(f"({v1}, {v2})", set_result, list_result)
+    deletion_table = run_phase(
+        Phase("Tree Node Deletion Operations", "Delete", "delete", lambda _: "Removed"),
+        edges[:deletion_count], backends, times, profiler)
+    verification_table = run_phase(
+        Phase("Deletion Verification Operations", "Verify Deletion", "lookup", str),
+        edges[:deletion_count], backends, times, profiler)
 
     results_table = Table(title="Experimental Results")
     results_table.add_column("Implementation", style="green")
@@ -123,54 +221,17 @@ def run_demo(num_vertices=20, quiet=False):
     results_table.add_column("Total Time (sec)", style="white")
     results_table.add_column("Average Time (sec)", style="magenta")
 
-    results_table.add_row(
-    	"Set",
-		"Insert",
-		str(len(set_insert_times)),
-		f"{sum(set_insert_times):.10f}",
-		f"{(sum(set_insert_times) / len(set_insert_times)):.10f}")
-    results_table.add_row(
-    	"Set",
-		"Lookup",
-		str(len(set_lookup_times)),
-		f"{sum(set_lookup_times):.10f}",
-		f"{(sum(set_lookup_times) / len(set_lookup_times)):.10f}")
-    results_table.add_row(
-    	"Set",
-		"Delete",
-		str(len(set_delete_times)),
-		f"{sum(set_delete_times):.10f}",
-		f"{(sum(set_delete_times) / len(set_delete_times)):.10f}")   
-    results_table.add_row(
-    	"Set",
-		"Verify Deletion",
-		str(len(set_verify_times)),
-		f"{sum(set_verify_times):.10f}",
-		f"{(sum(set_verify_times) / len(set_verify_times)):.10f}")
-    results_table.add_row(
-    	"List",
-		"Insert",
-		str(len(list_insert_times)),
-		f"{sum(list_insert_times):.10f}",
-		f"{(sum(list_insert_times) / len(list_insert_times)):.10f}")
-    results_table.add_row(
-    	"List",
-		"Lookup",
-		str(len(list_lookup_times)),
-		f"{sum(list_lookup_times):.10f}",
-		f"{(sum(list_lookup_times) / len(list_lookup_times)):.10f}")
-    results_table.add_row(
-    	"List",
-		"Delete",
-		str(len(list_delete_times)),
-		f"{sum(list_delete_times):.10f}",
-		f"{(sum(list_delete_times) / len(list_delete_times)):.10f}") 
-    results_table.add_row(
-    	"List",
-		"Verify Deletion",
-		str(len(list_verify_times)),
-		f"{sum(list_verify_times):.10f}",
-		f"{(sum(list_verify_times) / len(list_verify_times)):.10f}")
+    for backend in backends:
+        for operation in operations:
+            operation_times = times[backend.name, operation]
+            total = sum(operation_times)
+            average = total / len(operation_times) if operation_times else 0.0
+            results_table.add_row(
+                backend.name,
+                operation,
+                str(len(operation_times)),
+                f"{total:.10f}",
+                f"{average:.10f}")
 
     if quiet:
         console.print("\n[bold blue]Tree Implementation Comparison Results Summary[/bold blue]\n")
@@ -182,6 +243,14 @@ def run_demo(num_vertices=20, quiet=False):
         console.print(deletion_table)
         console.print(verification_table)
 
+    if frozen_table is not None:
+        console.print(frozen_table)
+
+    if profiler is not None and profile_dir is not None:
+        console.print("\n[bold blue]Collapsed Stack Profiles[/bold blue]\n")
+        for path in profiler.write(profile_dir):
+            console.print(f"Wrote {path}")
+
 
 def show_help():
     console = Console()
@@ -195,6 +264,9 @@ def show_help():
 
     options_table.add_row("-v, --vertices", "Number of vertices in the test tree", "20")
     options_table.add_row("-q, --quiet", "Reduce output verbosity", "False")
+    options_table.add_row("-i, --impl", f"Implementations to compare ({', '.join(BACKENDS)})", "all")
+    options_table.add_row("-f, --freeze", "Compare frozen and mutable set lookups", "False")
+    options_table.add_row("-p, --profile [DIR]", "Profile each operation and write collapsed stacks to DIR", "profiles")
     options_table.add_row("--help", "Show this help message", "")
 
     console.print(options_table)
@@ -207,6 +279,9 @@ def main():
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("-v", "--vertices", type=int, default=20, help=argparse.SUPPRESS)
     parser.add_argument("-q", "--quiet", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("-i", "--impl", nargs="+", choices=list(BACKENDS), default=None, help=argparse.SUPPRESS)
+    parser.add_argument("-f", "--freeze", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("-p", "--profile", nargs="?", const="profiles", default=None, help=argparse.SUPPRESS)
     parser.add_argument("--help", "-h", action="store_true", help=argparse.SUPPRESS)
 
     args = parser.parse_args()
@@ -214,7 +289,7 @@ def main():
     if args.vertices < 2:
         parser.error("Number of vertices must be at least 2")
 
-    run_demo(args.vertices, args.quiet)
+    run_demo(args.vertices, args.quiet, args.profile, args.freeze, args.impl)
 
 if __name__ == "__main__":
     main()
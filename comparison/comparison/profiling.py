@@ -0,0 +1,141 @@
+"""Profiles benchmark operations and writes flamegraph-ready collapsed stacks."""
+
+import cProfile
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+# A function key as recorded by cProfile: (filename, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+# The profiler's own disable call is recorded at the end of every runcall
+PROFILER_DISABLE = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+
+def frame_label(function: FunctionKey) -> str:
+    """Format a cProfile function key as a single collapsed-stack frame.
+
+    Args:
+        function: The (filename, line number, function name) key
+
+    Returns:
+        str: A frame label such as "insert_edge (set.py:8)"
+    """
+    filename, lineno, name = function
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    # Semicolons separate frames in the collapsed format
+    return label.replace(";", ",")
+
+
+def collapse_stats(stats: Dict[FunctionKey, Any]) -> Dict[str, int]:
+    """Convert raw cProfile stats into collapsed stacks weighted in nanoseconds.
+
+    cProfile only records caller-callee edges, so full stacks are rebuilt by
+    walking down from the root functions and splitting each function's time
+    across its call paths in proportion to the time spent on each edge.
+
+    Args:
+        stats: The stats dictionary of a cProfile.Profile after create_stats()
+
+    Returns:
+        Dict[str, int]: A mapping from "root;...;leaf" stacks to self time
+    """
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    roots = []
+    for function, (_, _, _, _, callers) in stats.items():
+        if function[2] == PROFILER_DISABLE:
+            continue
+        # A function only called by itself is still a root of the profile
+        if not callers.keys() - {function}:
+            roots.append(function)
+        for caller, (_, _, _, edge_time) in callers.items():
+            callees.setdefault(caller, []).append((function, edge_time))
+
+    stacks: Dict[str, int] = {}
+
+    def walk(function: FunctionKey, path: List[str], seen: Set[FunctionKey], time: float) -> None:
+        """Record the self time of a function on one path and descend."""
+        _, _, total_self, total_cumulative, _ = stats[function]
+        share = time / total_cumulative if total_cumulative > 0 else 0.0
+        path = [*path, frame_label(function)]
+        seen = seen | {function}
+        self_time = total_self * share
+        for callee, edge_time in callees.get(function, []):
+            # Recursive calls are folded into the first occurrence on the path
+            if callee in seen:
+                continue
+            walk(callee, path, seen, edge_time * share)
+        weight = round(self_time * 1e9)
+        if weight > 0:
+            stack = ";".join(path)
+            stacks[stack] = stacks.get(stack, 0) + weight
+
+    for root in roots:
+        walk(root, [], set(), stats[root][3])
+    return stacks
+
+
+class OperationProfiler:
+    def __init__(self) -> None:
+        """Initialize with one cProfile.Profile per implementation/operation."""
+        self.profiles: Dict[Tuple[str, str], cProfile.Profile] = {}
+
+    def runcall(self, implementation: str, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Call a function under the profiler for an implementation/operation.
+
+        Args:
+            implementation: The implementation name, such as "Set"
+            operation: The operation name, such as "Lookup"
+            func: The data structure method to call
+            *args: The arguments passed to the method
+
+        Returns:
+            Any: The value returned by the method
+        """
+        key = (implementation, operation)
+        if key not in self.profiles:
+            self.profiles[key] = cProfile.Profile()
+        return self.profiles[key].runcall(func, *args)
+
+    def collapsed_stacks(self, implementation: str, operation: str) -> Dict[str, int]:
+        """Return the collapsed stacks for one implementation/operation.
+
+        Args:
+            implementation: The implementation name
+            operation: The operation name
+
+        Returns:
+            Dict[str, int]: A mapping from stacks to self time in nanoseconds
+        """
+        profile = self.profiles.get((implementation, operation))
+        if profile is None:
+            return {}
+        profile.create_stats()
+        return collapse_stats(profile.stats)  # type: ignore[attr-defined]
+
+    def write(self, directory: str) -> List[Path]:
+        """Write one collapsed-stack file per implementation/operation.
+
+        Files are named like "set-verify_deletion.folded" and can be passed
+        directly to flamegraph.pl, speedscope, or inferno.
+
+        Args:
+            directory: The directory to write the files into
+
+        Returns:
+            List[Path]: The paths of the files that were written
+        """
+        output_dir = Path(directory)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for implementation, operation in self.profiles:
+            name = f"{implementation}-{operation}".lower().replace(" ", "_")
+            path = output_dir / f"{name}.folded"
+            stacks = self.collapsed_stacks(implementation, operation)
+            lines = [f"{stack} {weight}\n" for stack, weight in sorted(stacks.items())]
+            path.write_text("".join(lines))
+            paths.append(path)
+        return paths
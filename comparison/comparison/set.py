@@ -1,4 +1,6 @@
-from typing import Dict, Set
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 class Graph:
     def __init__(self) -> None:
@@ -54,6 +56,121 @@ class Graph:
         """Return the current graph structure."""
         return self.graph.copy()
 
+    def freeze(self) -> "FrozenGraph":
+        """Return an immutable compressed-sparse-row copy of the graph."""
+        return FrozenGraph(self.graph)
+
+
+# Largest value range, relative to the node count, that gets a direct-index remap
+DIRECT_INDEX_SLACK = 1024
+
+# Largest bitset adjacency matrix, as a multiple of the neighbor array size
+BITSET_MAX_RATIO = 2
+
+# Node values outside this range cannot be stored in an array("q")
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+
+class FrozenGraph:
+    def __init__(self, graph: Dict[int, Set[int]]) -> None:
+        """Build a compressed-sparse-row graph from a dictionary of sets.
+
+        Node values are remapped to dense ids by their position in the sorted
+        nodes array. When the values span a small range, the value-to-id remap
+        is a direct-index array holding -1 for missing values; otherwise it is
+        a dictionary. The neighbor ids of the node with id i are stored, sorted,
+        in neighbors[offsets[i]:offsets[i + 1]]. Edge lookups use a bitset
+        adjacency matrix when it is no larger than BITSET_MAX_RATIO times the
+        neighbor array, and otherwise binary search the neighbor ids. Node
+        values that do not fit in 64 bits are kept in a list instead of an
+        array.
+        """
+        values = sorted(graph)
+        self.nodes: Union[array, List[int]]
+        if values and (values[0] < INT64_MIN or values[-1] > INT64_MAX):
+            self.nodes = values
+        else:
+            self.nodes = array("q", values)
+        node_count = len(self.nodes)
+        self.base = self.nodes[0] if node_count else 0
+        span = self.nodes[-1] - self.base + 1 if node_count else 0
+        self.remap: Union[array, Dict[int, int]]
+        if span <= 4 * node_count + DIRECT_INDEX_SLACK:
+            self.remap = array("q", [-1]) * span
+            for node_id, node in enumerate(self.nodes):
+                self.remap[node - self.base] = node_id
+        else:
+            self.remap = {node: node_id for node_id, node in enumerate(self.nodes)}
+
+        self.offsets = array("q", [0])
+        self.neighbors = array("q")
+        for node in self.nodes:
+            self.neighbors.extend(sorted(self._node_id(neighbor) for neighbor in graph[node]))
+            self.offsets.append(len(self.neighbors))
+
+        self.bits: Optional[bytearray] = None
+        bitset_bytes = (node_count * node_count + 7) // 8
+        if bitset_bytes <= BITSET_MAX_RATIO * self.neighbors.itemsize * len(self.neighbors):
+            self.bits = bytearray(bitset_bytes)
+            for node_id in range(node_count):
+                row = node_id * node_count
+                for neighbor_id in self.neighbors[self.offsets[node_id]:self.offsets[node_id + 1]]:
+                    bit = row + neighbor_id
+                    self.bits[bit >> 3] |= 1 << (bit & 7)
+
+    def _node_id(self, node: int) -> int:
+        """Return the dense id of a node, or -1 if it is not in the graph."""
+        if isinstance(self.remap, dict):
+            return self.remap.get(node, -1)
+        index = node - self.base
+        if 0 <= index < len(self.remap):
+            return self.remap[index]
+        return -1
+
+    def lookup_node(self, node: int) -> bool:
+        """Check if a node exists in the graph."""
+        return self._node_id(node) != -1
+
+    def lookup_edge(self, node1: int, node2: int) -> bool:
+        """Check if an edge exists between two nodes."""
+        remap = self.remap
+        if isinstance(remap, dict):
+            id1 = remap.get(node1, -1)
+            id2 = remap.get(node2, -1)
+        else:
+            # The remap is inlined here because this is the read-mostly hot path
+            index1 = node1 - self.base
+            index2 = node2 - self.base
+            span = len(remap)
+            id1 = remap[index1] if 0 <= index1 < span else -1
+            id2 = remap[index2] if 0 <= index2 < span else -1
+        if id1 == -1 or id2 == -1:
+            return False
+        bits = self.bits
+        if bits is not None:
+            bit = id1 * len(self.nodes) + id2
+            return bits[bit >> 3] >> (bit & 7) & 1 == 1
+        end = self.offsets[id1 + 1]
+        index = bisect_left(self.neighbors, id2, self.offsets[id1], end)
+        return index < end and self.neighbors[index] == id2
+
+    def get_neighbors(self, node: int) -> Tuple[int, ...]:
+        """Return all neighbors of a given node in sorted order."""
+        node_id = self._node_id(node)
+        if node_id == -1:
+            return ()
+        neighbor_ids = self.neighbors[self.offsets[node_id]:self.offsets[node_id + 1]]
+        return tuple(map(self.nodes.__getitem__, neighbor_ids))
+
+    def get_graph_size(self) -> int:
+        """Return the number of nodes in the graph."""
+        return len(self.nodes)
+
+    def get_graph_structure(self) -> Dict[int, Set[int]]:
+        """Return the graph structure as a dictionary of sets."""
+        return {node: set(self.get_neighbors(node)) for node in self.nodes}
+
 if __name__ == "__main__":
     g = Graph()
     g.insert_edge(1, 2)
@@ -0,0 +1,80 @@
+from typing import Dict
+
+import pytest
+
+from comparison.backends import (
+    BACKENDS,
+    RESERVED_NAMES,
+    ListBackend,
+    SetBackend,
+    create_backends,
+    register_backend,
+)
+
+
+def test_registry_contains_builtin_backends():
+    assert list(BACKENDS)[:2] == ["set", "list"]
+    assert BACKENDS["set"] is SetBackend
+    assert BACKENDS["list"] is ListBackend
+
+@pytest.mark.parametrize("key", ["set", "list"])
+def test_backend_operations(key):
+    [backend] = create_backends([key])
+    backend.insert(1, 2)
+    backend.insert(2, 3)
+    assert backend.lookup(1, 2) is True
+    assert backend.lookup(1, 3) is False
+    assert backend.size() > 0
+    backend.delete(1, 2)
+    assert backend.lookup(1, 2) is False
+    assert backend.lookup(2, 3) is True
+
+def test_create_backends_uses_registry_order():
+    backends = create_backends(["list", "set"])
+    assert [backend.name for backend in backends] == ["Set", "List"]
+    assert len(create_backends()) == len(BACKENDS)
+
+def test_create_backends_returns_fresh_instances():
+    first, = create_backends(["set"])
+    first.insert(1, 2)
+    second, = create_backends(["set"])
+    assert second.lookup(1, 2) is False
+
+def test_create_backends_rejects_unknown_key():
+    with pytest.raises(ValueError, match="tuple"):
+        create_backends(["tuple"])
+
+def test_register_backend():
+    @register_backend("test-dict")
+    class DictBackend:
+        name = "Dict"
+
+        def __init__(self) -> None:
+            self.tree: Dict[int, int] = {}
+            self.insert = self.tree.__setitem__
+            self.size = self.tree.__len__
+
+        def lookup(self, parent, child):
+            return self.tree.get(parent) == child
+
+        def delete(self, parent, child):
+            self.tree.pop(parent, None)
+
+    try:
+        [backend] = create_backends(["test-dict"])
+        backend.insert(1, 2)
+        assert backend.lookup(1, 2) is True
+        with pytest.raises(ValueError, match="already registered"):
+            register_backend("test-dict")(DictBackend)
+        with pytest.raises(ValueError, match="displayed as 'Dict'"):
+            register_backend("test-dict-copy")(DictBackend)
+        assert "test-dict-copy" not in BACKENDS
+    finally:
+        del BACKENDS["test-dict"]
+
+@pytest.mark.parametrize("name", sorted(RESERVED_NAMES))
+def test_register_backend_rejects_reserved_names(name):
+    backend = type("ReservedBackend", (ListBackend,), {"name": name})
+    with pytest.raises(ValueError, match="reserved"):
+        register_backend("test-reserved")(backend)
+    assert "test-reserved" not in BACKENDS
@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 import io
 
-from comparison.main import run_demo, show_help, main
+from comparison.main import build_set_graph, measure_memory, run_demo, show_help, main
 from comparison.set import Graph as SetGraph
 from comparison.list_process import ListProcessor
 from comparison.generate import generate_random_tree_with_random_values_list
@@ -82,6 +82,9 @@ class TestMainFunctionality:
         assert "Command Options" in output
         assert "-v, --vertices" in output
         assert "-q, --quiet" in output
+        assert "-i, --impl" in output
+        assert "-f, --freeze" in output
+        assert "-p, --profile" in output
         assert "--help" in output
 
     @patch('comparison.main.run_demo')
@@ -90,7 +93,7 @@ class TestMainFunctionality:
         """Test main function with vertex count argument."""
         main()
         # Check that run_demo was called with the right arguments
-        mock_run_demo.assert_called_once_with(15, False)
+        mock_run_demo.assert_called_once_with(15, False, None, False, None)
 
     @patch('comparison.main.run_demo')
     @patch('sys.argv', ['comparison', '-q'])
@@ -98,7 +101,95 @@ class TestMainFunctionality:
         """Test main function with quiet mode argument."""
         main()
         # Check that run_demo was called with quiet=True
-        mock_run_demo.assert_called_once_with(20, True)
+        mock_run_demo.assert_called_once_with(20, True, None, False, None)
+
+    @patch('comparison.main.run_demo')
+    @patch('sys.argv', ['comparison', '--profile'])
+    def test_main_with_profile_argument(self, mock_run_demo):
+        """Test main function with profile argument and default directory."""
+        main()
+        mock_run_demo.assert_called_once_with(20, False, "profiles", False, None)
+
+    @patch('comparison.main.run_demo')
+    @patch('sys.argv', ['comparison', '--impl', 'list'])
+    def test_main_with_impl_argument(self, mock_run_demo):
+        """Test main function with implementation selection."""
+        main()
+        mock_run_demo.assert_called_once_with(20, False, None, False, ['list'])
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.argv', ['comparison', '--impl', 'tuple'])
+    def test_main_with_unknown_impl(self, mock_stderr):
+        """Test error handling for an unregistered implementation."""
+        with pytest.raises(SystemExit):
+            main()
+        assert "invalid choice" in mock_stderr.getvalue()
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_run_demo_single_implementation(self, mock_stdout):
+        """Test that run_demo only benchmarks the selected implementations."""
+        run_demo(num_vertices=5, quiet=False, implementations=['set'])
+        output = mock_stdout.getvalue()
+
+        assert "Set Implementation" in output
+        assert "List Implementation" not in output
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_run_demo_without_deletions(self, mock_stdout):
+        """Test that a two vertex tree with no deletions still summarizes."""
+        run_demo(num_vertices=2, quiet=True)
+        output = mock_stdout.getvalue()
+
+        assert "Experimental Results" in output
+
+    @patch('comparison.main.run_demo')
+    @patch('sys.argv', ['comparison', '-q', '--freeze'])
+    def test_main_with_freeze_argument(self, mock_run_demo):
+        """Test main function with freeze argument."""
+        main()
+        mock_run_demo.assert_called_once_with(20, True, None, True, None)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_run_demo_freeze_mode(self, mock_stdout):
+        """Test that freeze mode prints the frozen vs mutable comparison."""
+        run_demo(num_vertices=5, quiet=True, freeze=True)
+        output = mock_stdout.getvalue()
+
+        assert "Frozen vs Mutable Set Comparison" in output
+        assert "Frozen Set" in output
+        assert "Mutable Set" in output
+        assert "Neighbors" in output
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_run_demo_profile_mode(self, mock_stdout, tmp_path):
+        """Test that profile mode writes one collapsed-stack file per operation."""
+        run_demo(num_vertices=5, quiet=True, profile_dir=str(tmp_path))
+        output = mock_stdout.getvalue()
+
+        assert "Collapsed Stack Profiles" in output
+        names = {path.name for path in tmp_path.iterdir()}
+        assert "set-insert.folded" in names
+        assert "list-lookup.folded" in names
+        assert "list-verify_deletion.folded" in names
+        assert "harness-lookup.folded" in names
+        assert len(names) == 12
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_run_demo_profile_includes_harness_frames(self, mock_stdout, tmp_path):
+        """Test that harness frames appear next to data structure frames."""
+        run_demo(num_vertices=50, quiet=True, profile_dir=str(tmp_path))
+
+        stacks = [
+            line.rsplit(" ", 1)[0]
+            for line in (tmp_path / "list-lookup.folded").read_text().splitlines()
+        ]
+        assert all(stack.startswith("run_step (main.py:") for stack in stacks)
+        assert any("time_operation (main.py:" in stack for stack in stacks)
+        assert any("lookup_tree_pair (list_process.py:" in stack for stack in stacks)
+
+        harness = (tmp_path / "harness-lookup.folded").read_text()
+        assert "add_edge_row (main.py:" in harness
+        assert "add_row (table.py:" in harness
 
     @patch('comparison.main.show_help')
     @patch('sys.argv', ['comparison', '--help'])
@@ -135,6 +226,108 @@ class TestMainFunctionality:
         assert set_tree.lookup_edge(1, 2) is False
         assert set_tree.lookup_edge(2, 3) is True
 
+    def test_frozen_set_tree_operations(self):
+        """Test that a frozen SetGraph answers the same queries as the original."""
+        set_tree = SetGraph()
+        for v1, v2 in [(5, 1), (5, 9), (9, 3), (1, 1)]:
+            set_tree.insert_edge(v1, v2)
+        frozen_tree = set_tree.freeze()
+
+        assert frozen_tree.get_graph_size() == set_tree.get_graph_size()
+        assert frozen_tree.get_graph_structure() == set_tree.get_graph_structure()
+        assert frozen_tree.lookup_node(9) is True
+        assert frozen_tree.lookup_node(2) is False
+        assert frozen_tree.lookup_edge(5, 9) is True
+        assert frozen_tree.lookup_edge(9, 5) is True
+        assert frozen_tree.lookup_edge(1, 1) is True
+        assert frozen_tree.lookup_edge(5, 3) is False
+        assert frozen_tree.lookup_edge(7, 1) is False
+        assert frozen_tree.get_neighbors(5) == (1, 9)
+        assert frozen_tree.get_neighbors(7) == ()
+
+        # Freezing takes a snapshot, so later updates do not leak through
+        set_tree.update_edge(5, 9, False)
+        assert frozen_tree.lookup_edge(5, 9) is True
+
+    def test_frozen_matches_generated_tree(self):
+        """Test that frozen lookups match mutable lookups on generated data."""
+        edges = generate_random_tree_with_random_values_list(200)
+        set_tree = SetGraph()
+        for v1, v2 in edges:
+            set_tree.insert_edge(v1, v2)
+        frozen_tree = set_tree.freeze()
+
+        for v1, v2 in edges:
+            assert frozen_tree.lookup_edge(v1, v2) is True
+            assert set(frozen_tree.get_neighbors(v1)) == set_tree.get_neighbors(v1)
+        for v1 in range(0, 1001, 7):
+            for v2 in range(0, 1001, 101):
+                assert frozen_tree.lookup_edge(v1, v2) == set_tree.lookup_edge(v1, v2)
+
+    def test_frozen_sparse_values_fall_back(self, monkeypatch):
+        """Test the dictionary remap and binary search used for large domains."""
+        monkeypatch.setattr("comparison.set.BITSET_MAX_RATIO", 0)
+        set_tree = SetGraph()
+        for v1, v2 in [(10**9, 5), (5, -(10**9)), (-(10**9), 7)]:
+            set_tree.insert_edge(v1, v2)
+        frozen_tree = set_tree.freeze()
+
+        assert isinstance(frozen_tree.remap, dict)
+        assert frozen_tree.bits is None
+        assert frozen_tree.get_graph_structure() == set_tree.get_graph_structure()
+        assert frozen_tree.lookup_edge(10**9, 5) is True
+        assert frozen_tree.lookup_edge(7, -(10**9)) is True
+        assert frozen_tree.lookup_edge(10**9, 7) is False
+        assert frozen_tree.lookup_edge(6, 5) is False
+        assert frozen_tree.get_neighbors(5) == (-(10**9), 10**9)
+
+    def test_frozen_small_domain_uses_direct_index_and_bitset(self):
+        """Test that small value ranges use the direct-index remap and bitset."""
+        set_tree = SetGraph()
+        for v1, v2 in [(0, 1000), (1000, 500)]:
+            set_tree.insert_edge(v1, v2)
+        frozen_tree = set_tree.freeze()
+
+        assert not isinstance(frozen_tree.remap, dict)
+        assert frozen_tree.bits is not None
+        assert frozen_tree.lookup_edge(500, 1000) is True
+        assert frozen_tree.lookup_edge(0, 500) is False
+        assert frozen_tree.lookup_edge(-1, 0) is False
+        assert frozen_tree.lookup_edge(0, 1001) is False
+        assert frozen_tree.lookup_node(999) is False
+
+    def test_frozen_memory_near_bitset_cutoff(self):
+        """Test that freezing never uses more memory than the mutable graph."""
+        bitset_used = set()
+        for num_nodes in [64, 128, 200, 250, 255, 256, 260, 300, 512, 1500, 2000, 2890]:
+            edges = [(node, node + 1) for node in range(num_nodes - 1)]
+            set_tree, mutable_memory = measure_memory(build_set_graph, edges)
+            frozen_tree, frozen_memory = measure_memory(set_tree.freeze)
+            bitset_used.add(frozen_tree.bits is not None)
+            assert frozen_memory <= mutable_memory, num_nodes
+        # The sizes above cover both sides of the bitset cutoff
+        assert bitset_used == {True, False}
+
+    def test_frozen_values_outside_int64(self):
+        """Test that node values too large for an int64 array can be frozen."""
+        set_tree = SetGraph()
+        set_tree.insert_edge(2**63, 1)
+        set_tree.insert_edge(1, -(2**70))
+        frozen_tree = set_tree.freeze()
+
+        assert frozen_tree.get_graph_structure() == set_tree.get_graph_structure()
+        assert frozen_tree.lookup_edge(2**63, 1) is True
+        assert frozen_tree.lookup_edge(1, -(2**70)) is True
+        assert frozen_tree.lookup_edge(2**63, -(2**70)) is False
+        assert frozen_tree.get_neighbors(1) == (-(2**70), 2**63)
+
+        # A small range of huge values still uses the direct-index remap
+        set_tree = SetGraph()
+        set_tree.insert_edge(2**64, 2**64 + 1)
+        frozen_tree = set_tree.freeze()
+        assert not isinstance(frozen_tree.remap, dict)
+        assert frozen_tree.lookup_edge(2**64 + 1, 2**64) is True
+
     def test_list_tree_operations(self):
         """Test that ListProcessor operations work correctly."""
         list_tree = ListProcessor()
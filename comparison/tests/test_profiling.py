@@ -0,0 +1,59 @@
+from comparison.list_process import ListProcessor
+from comparison.profiling import OperationProfiler, collapse_stats, frame_label
+from comparison.set import Graph as SetGraph
+
+
+def test_frame_label():
+    assert frame_label(("/tmp/comparison/set.py", 8, "insert_edge")) == "insert_edge (set.py:8)"
+    assert frame_label(("~", 0, "<method 'add' of 'set' objects>")) == "<method 'add' of 'set' objects>"
+    assert ";" not in frame_label(("a;b.py", 1, "f"))
+
+def test_collapse_stats_splits_time_across_edges():
+    root = ("main.py", 1, "root")
+    child = ("main.py", 5, "child")
+    stats = {
+        root: (1, 1, 0.000001, 0.000003, {}),
+        child: (2, 2, 0.000002, 0.000002, {root: (2, 2, 0.000002, 0.000002)}),
+    }
+    stacks = collapse_stats(stats)
+    assert stacks == {
+        "root (main.py:1)": 1000,
+        "root (main.py:1);child (main.py:5)": 2000,
+    }
+
+def test_collapse_stats_skips_recursion_and_disable():
+    func = ("main.py", 1, "func")
+    disable = ("~", 0, "<method 'disable' of '_lsprof.Profiler' objects>")
+    stats = {
+        func: (2, 1, 0.000004, 0.000004, {func: (1, 1, 0.000002, 0.000002)}),
+        disable: (1, 1, 0.000001, 0.000001, {}),
+    }
+    stacks = collapse_stats(stats)
+    assert list(stacks) == ["func (main.py:1)"]
+
+def test_profiler_records_each_operation_separately():
+    profiler = OperationProfiler()
+    set_tree = SetGraph()
+    list_tree = ListProcessor()
+    for _ in range(50):
+        profiler.runcall("Set", "Insert", set_tree.insert_edge, 1, 2)
+        assert profiler.runcall("List", "Lookup", list_tree.lookup_tree_pair, 1, 2) is False
+
+    set_stacks = profiler.collapsed_stacks("Set", "Insert")
+    list_stacks = profiler.collapsed_stacks("List", "Lookup")
+    assert all(stack.startswith("insert_edge (set.py:") for stack in set_stacks)
+    assert all(stack.startswith("lookup_tree_pair (list_process.py:") for stack in list_stacks)
+    assert profiler.collapsed_stacks("Set", "Delete") == {}
+
+def test_profiler_write(tmp_path):
+    profiler = OperationProfiler()
+    set_tree = SetGraph()
+    for node in range(100):
+        profiler.runcall("Set", "Verify Deletion", set_tree.lookup_edge, node, node + 1)
+
+    paths = profiler.write(str(tmp_path / "profiles"))
+    assert [path.name for path in paths] == ["set-verify_deletion.folded"]
+    for line in paths[0].read_text().splitlines():
+        stack, weight = line.rsplit(" ", 1)
+        assert stack.startswith("lookup_edge (set.py:")
+        assert int(weight) > 0